@@ -2,7 +2,12 @@
 import json
 import subprocess
 import os
-from typing import Optional, Dict, Any
+import shutil
+from typing import Optional, Dict, Any, Iterator, List, Literal, Tuple, overload
+
+# Bound once so each response parse skips the module attribute lookup and
+# the argument checks in json.loads().
+_decode_json = json.JSONDecoder().decode
 
 
 class SesshClient:
@@ -35,39 +40,73 @@ class SesshClient:
         self.identity = identity
         self.proxyjump = proxyjump
 
-    def _run_sessh(
-        self, cmd: str, *args: str, **kwargs: Any
-    ) -> Dict[str, Any]:
-        """Run sessh command and return JSON response."""
-        env = os.environ.copy()
-        env["SESSH_JSON"] = "1"
+        # Resolved sessh binary, rebuilt when sessh_bin or PATH changes
+        self._bin_path = self.sessh_bin
+        self._bin_key: Optional[Tuple[str, Optional[str]]] = None
+
+    def _env_overlay(self) -> Dict[str, str]:
+        """Return the SESSH_* variables derived from the client options."""
+        overlay = {}
         if self.identity:
-            env["SESSH_IDENTITY"] = self.identity
+            overlay["SESSH_IDENTITY"] = self.identity
         if self.proxyjump:
-            env["SESSH_PROXYJUMP"] = self.proxyjump
-
-        sessh_args = [self.sessh_bin, cmd, self.alias, self.host]
+            overlay["SESSH_PROXYJUMP"] = self.proxyjump
+        return overlay
+
+    def _sessh_env(self) -> Dict[str, str]:
+        """Return the environment for JSON sessh calls, read from os.environ."""
+        return {**os.environ, "SESSH_JSON": "1", **self._env_overlay()}
+
+    def _sessh_args(self, cmd: str, args: Tuple[str, ...]) -> List[str]:
+        """Build the sessh argv for a command."""
+        # Absolute path resolved once per sessh_bin/PATH, so exec skips the search
+        bin_key = (self.sessh_bin, os.environ.get("PATH"))
+        if self._bin_key != bin_key:
+            found = shutil.which(self.sessh_bin)
+            self._bin_path = os.path.abspath(found) if found else self.sessh_bin
+            self._bin_key = bin_key
+
+        sessh_args = [self._bin_path, cmd, self.alias, self.host]
         if self.port:
             sessh_args.append(str(self.port))
         sessh_args.extend(args)
+        return sessh_args
+
+    def _invoke(
+        self, cmd: str, args: Tuple[str, ...]
+    ) -> "subprocess.CompletedProcess[bytes]":
+        """
+        Run a sessh command and return the completed process.
 
+        Raises RuntimeError when sessh exits non-zero without printing a
+        response; a non-zero exit with JSON on stdout is returned as is.
+        """
+        # Capture raw bytes and decode once; text mode would run stdout
+        # through an incremental decoder and newline translation first.
         result = subprocess.run(
-            sessh_args,
+            self._sessh_args(cmd, args),
+            stdin=subprocess.DEVNULL,
             capture_output=True,
-            text=True,
-            env=env,
+            env=self._sessh_env(),
             check=False,
         )
 
         if result.returncode != 0 and not result.stdout:
+            stderr = result.stderr.decode("utf-8", "replace")
             raise RuntimeError(
-                f"sessh {cmd} failed: {result.stderr or f'exit code {result.returncode}'}"
+                f"sessh {cmd} failed: {stderr or f'exit code {result.returncode}'}"
             )
+        return result
 
+    def _run_sessh(
+        self, cmd: str, *args: str, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Run sessh command and return JSON response."""
+        stdout = self._invoke(cmd, args).stdout.decode("utf-8", "replace")
         try:
-            return json.loads(result.stdout)
+            return _decode_json(stdout)
         except json.JSONDecodeError:
-            raise RuntimeError(f"Invalid JSON from sessh: {result.stdout}")
+            raise RuntimeError(f"Invalid JSON from sessh: {stdout}")
 
     def open(self) -> Dict[str, Any]:
         """Open or ensure a persistent remote tmux session."""
@@ -82,6 +121,45 @@ class SesshClient:
         """
         return self._run_sessh("run", "--", command)
 
+    def run_many(
+        self, commands: List[str], stop_on_error: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Send several commands into the tmux session with a single sessh call.
+
+        The commands are joined into one shell line, so each entry must be a
+        simple single-line command: no line breaks (tmux would press Enter
+        early), no trailing ``&``, ``;``, ``|`` or ``\\`` that would bind to
+        the separator, and no ``#`` comment, which would swallow every
+        command after it.
+
+        Args:
+            commands: Command strings to execute, in order
+            stop_on_error: Chain with ``&&`` so a failing command stops the
+                rest (default: True); otherwise chain with ``;``
+
+        Raises:
+            ValueError: If the list is empty, or an entry is blank, contains
+                a line break, or ends with ``&``, ``;``, ``|`` or ``\\``
+        """
+        if not commands:
+            raise ValueError("run_many requires at least one command")
+        for command in commands:
+            stripped = command.strip()
+            if not stripped:
+                raise ValueError("run_many commands must not be blank")
+            if "\n" in command or "\r" in command:
+                raise ValueError(
+                    f"run_many command must be a single line: {command!r}"
+                )
+            if stripped.endswith(("&", ";", "|", "\\")):
+                raise ValueError(
+                    "run_many command must not end with '&', ';', '|' or "
+                    f"'\\': {command!r}"
+                )
+        separator = " && " if stop_on_error else "; "
+        return self.run(separator.join(commands))
+
     def logs(self, lines: int = 300) -> Dict[str, Any]:
         """
         Capture recent output from the tmux session.
@@ -91,12 +169,54 @@ class SesshClient:
         """
         return self._run_sessh("logs", str(lines))
 
+    def stream_logs(self, lines: int = 300) -> Iterator[str]:
+        """
+        Iterate over recent output from the tmux session line by line.
+
+        sessh returns the capture as a single JSON document, so the output is
+        fetched once and then yielded lazily with line endings preserved.
+
+        Args:
+            lines: Number of lines to capture (default: 300)
+
+        Raises:
+            RuntimeError: If sessh reports the capture failed
+        """
+        response = self.logs(lines)
+        if response.get("ok") is False:
+            error = response.get("error") or "unknown error"
+            raise RuntimeError(f"sessh logs failed: {error}")
+        output = response.get("output") or ""
+        yield from output.splitlines(keepends=True)
+
     def status(self) -> Dict[str, Any]:
         """Check whether the SSH controlmaster and tmux session exist."""
         return self._run_sessh("status")
 
-    def close(self) -> Dict[str, Any]:
-        """Kill tmux session and close the controlmaster."""
+    @overload
+    def close(self, parse: Literal[True] = ...) -> Dict[str, Any]: ...
+
+    @overload
+    def close(self, parse: Literal[False]) -> None: ...
+
+    @overload
+    def close(self, parse: bool) -> Optional[Dict[str, Any]]: ...
+
+    def close(self, parse: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Kill tmux session and close the controlmaster.
+
+        Args:
+            parse: Return the parsed sessh response (default: True). Pass
+                False in teardown paths that ignore the result; the reply is
+                still read but not decoded, so a truncated or non-JSON reply
+                from a dying session does not raise, and None is returned.
+                Otherwise errors follow the same rule either way: raised only
+                when sessh exits non-zero without printing a response.
+        """
+        if not parse:
+            self._invoke("close", ())
+            return None
         return self._run_sessh("close")
 
     def attach(self) -> None:
@@ -105,15 +225,9 @@ class SesshClient:
 
         Note: This will block and take over the terminal.
         """
-        env = os.environ.copy()
-        if self.identity:
-            env["SESSH_IDENTITY"] = self.identity
-        if self.proxyjump:
-            env["SESSH_PROXYJUMP"] = self.proxyjump
-
-        sessh_args = [self.sessh_bin, "attach", self.alias, self.host]
-        if self.port:
-            sessh_args.append(str(self.port))
+        # No SESSH_JSON here: attach is interactive, not a JSON call
+        env = {**os.environ, **self._env_overlay()}
+        sessh_args = self._sessh_args("attach", ())
 
         # For attach, we want interactive mode, so use subprocess.run without capture_output
         subprocess.run(sessh_args, env=env, check=False)
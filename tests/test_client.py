@@ -1,73 +1,246 @@
 """Tests for sessh client (requires sessh binary and SSH setup)."""
+import os
+import subprocess
 import unittest
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 from sessh.client import SesshClient
 
 
+def _result(stdout, returncode=0, stderr=b""):
+    """Build a lightweight stand-in for subprocess.CompletedProcess."""
+    return SimpleNamespace(returncode=returncode, stdout=stdout, stderr=stderr)
+
+
 class TestSesshClient(unittest.TestCase):
     """Test SesshClient methods."""
 
     def setUp(self):
-        """Set up test client."""
+        """Set up test client and patch subprocess.run."""
+        patcher = patch("subprocess.run")
+        self.mock_run = patcher.start()
+        self.addCleanup(patcher.stop)
+        which_patcher = patch("shutil.which", return_value=None)
+        self.mock_which = which_patcher.start()
+        self.addCleanup(which_patcher.stop)
         self.client = SesshClient("test", "user@example.com")
 
-    @patch("subprocess.run")
-    def test_open(self, mock_run):
+    def test_open(self):
         """Test open command."""
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout='{"ok":true,"op":"open"}', stderr=""
-        )
+        self.mock_run.return_value = _result(b'{"ok":true,"op":"open"}')
         result = self.client.open()
         self.assertEqual(result["op"], "open")
-        mock_run.assert_called_once()
+        self.mock_run.assert_called_once()
 
-    @patch("subprocess.run")
-    def test_run(self, mock_run):
+    def test_run(self):
         """Test run command."""
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout='{"ok":true,"op":"run"}', stderr=""
-        )
+        self.mock_run.return_value = _result(b'{"ok":true,"op":"run"}')
         result = self.client.run("echo hello")
         self.assertEqual(result["op"], "run")
-        args = mock_run.call_args[0][0]
+        args = self.mock_run.call_args[0][0]
         self.assertIn("--", args)
         self.assertIn("echo hello", args)
 
-    @patch("subprocess.run")
-    def test_logs(self, mock_run):
+    def test_run_many(self):
+        """Test run_many joins commands into one run call."""
+        self.mock_run.return_value = _result(b'{"ok":true,"op":"run"}')
+        self.client.run_many(["cd /tmp", "pwd"])
+        args = self.mock_run.call_args[0][0]
+        self.assertIn("cd /tmp && pwd", args)
+        self.mock_run.assert_called_once()
+
+        self.client.run_many(["false", "echo after"], stop_on_error=False)
+        args = self.mock_run.call_args[0][0]
+        self.assertIn("false; echo after", args)
+
+    def test_run_many_empty(self):
+        """Test run_many rejects an empty command list."""
+        with self.assertRaises(ValueError):
+            self.client.run_many([])
+        self.mock_run.assert_not_called()
+
+    def test_run_many_rejects_unjoinable_entries(self):
+        """Test run_many rejects entries that break the joined line."""
+        for commands in (
+            ["a", "", "b"],
+            ["a", "   "],
+            ["sleep 100 &", "echo started"],
+            ["cd /tmp;", "pwd"],
+            ["echo a\nfalse", "echo b"],
+            ["echo a\r", "echo b"],
+            ["cat x |", "wc"],
+            ["a ||", "b"],
+            ["echo a \\", "echo b"],
+        ):
+            with self.assertRaises(ValueError):
+                self.client.run_many(commands)
+        self.mock_run.assert_not_called()
+
+    def test_logs(self):
         """Test logs command."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout='{"ok":true,"op":"logs","output":"test output"}',
-            stderr="",
+        self.mock_run.return_value = _result(
+            b'{"ok":true,"op":"logs","output":"test output"}'
         )
         result = self.client.logs(100)
         self.assertEqual(result["op"], "logs")
-        args = mock_run.call_args[0][0]
+        args = self.mock_run.call_args[0][0]
         self.assertIn("100", args)
 
-    @patch("subprocess.run")
-    def test_status(self, mock_run):
+    def test_stream_logs(self):
+        """Test stream_logs yields output lines."""
+        self.mock_run.return_value = _result(
+            b'{"ok":true,"op":"logs","output":"line 1\\nline 2\\n"}'
+        )
+        lines = list(self.client.stream_logs(50))
+        self.assertEqual(lines, ["line 1\n", "line 2\n"])
+        args = self.mock_run.call_args[0][0]
+        self.assertIn("logs", args)
+        self.assertIn("50", args)
+
+        self.mock_run.return_value = _result(
+            b'{"ok":true,"op":"logs","output":"a\\r\\nb\\n\\nlast"}'
+        )
+        lines = list(self.client.stream_logs(50))
+        self.assertEqual(lines, ["a\r\n", "b\n", "\n", "last"])
+
+    def test_stream_logs_error_raises(self):
+        """Test stream_logs raises when sessh reports a failure."""
+        self.mock_run.return_value = _result(
+            b'{"ok":false,"op":"logs","error":"no session"}', returncode=1
+        )
+        with self.assertRaisesRegex(RuntimeError, "no session"):
+            list(self.client.stream_logs(50))
+
+    def test_status(self):
         """Test status command."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout='{"ok":true,"op":"status","master":1,"session":1}',
-            stderr="",
+        self.mock_run.return_value = _result(
+            b'{"ok":true,"op":"status","master":1,"session":1}'
         )
         result = self.client.status()
         self.assertEqual(result["op"], "status")
         self.assertEqual(result["master"], 1)
 
-    @patch("subprocess.run")
-    def test_close(self, mock_run):
+    def test_close(self):
         """Test close command."""
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout='{"ok":true,"op":"close"}', stderr=""
-        )
+        self.mock_run.return_value = _result(b'{"ok":true,"op":"close"}')
         result = self.client.close()
         self.assertEqual(result["op"], "close")
 
+    def test_close_without_parse(self):
+        """Test close(parse=False) skips decoding and returns None."""
+        self.mock_run.return_value = _result(b'{"ok":true,"op":"close"}')
+        self.assertIsNone(self.client.close(parse=False))
+        self.assertIn("close", self.mock_run.call_args[0][0])
+
+        self.mock_run.return_value = _result(
+            b"", returncode=1, stderr=b"no such session"
+        )
+        with self.assertRaisesRegex(RuntimeError, "no such session"):
+            self.client.close(parse=False)
+
+    def test_close_nonzero_exit_with_json(self):
+        """Test a non-zero exit with a JSON response does not raise."""
+        self.mock_run.return_value = _result(
+            b'{"ok":false,"op":"close","error":"no session"}', returncode=1
+        )
+        result = self.client.close()
+        self.assertFalse(result["ok"])
+        self.assertIsNone(self.client.close(parse=False))
+
+    def test_close_without_parse_ignores_non_json_reply(self):
+        """Test close(parse=False) does not raise on a truncated reply."""
+        self.mock_run.return_value = _result(b'{"ok":tr', returncode=255)
+        self.assertIsNone(self.client.close(parse=False))
+        with self.assertRaisesRegex(RuntimeError, "Invalid JSON"):
+            self.client.close()
+
+    def test_env_follows_os_environ(self):
+        """Test each call sees the current process environment."""
+        self.mock_run.return_value = _result(b'{"ok":true,"op":"status"}')
+        client = SesshClient("test", "user@example.com", identity="~/.ssh/id")
+        client.status()
+        env = self.mock_run.call_args[1]["env"]
+        self.assertEqual(env["SESSH_JSON"], "1")
+        self.assertEqual(env["SESSH_IDENTITY"], "~/.ssh/id")
+        self.assertNotIn("SESSH_PROXYJUMP", env)
+
+        with patch.dict("os.environ", {"SSH_AUTH_SOCK": "/tmp/agent.sock"}):
+            client.status()
+            status_env = self.mock_run.call_args[1]["env"]
+            client.attach()
+            attach_env = self.mock_run.call_args[1]["env"]
+        self.assertEqual(status_env["SSH_AUTH_SOCK"], "/tmp/agent.sock")
+        self.assertEqual(attach_env["SSH_AUTH_SOCK"], "/tmp/agent.sock")
+
+    def test_env_and_args_rebuilt_on_change(self):
+        """Test changing client options takes effect on the next call."""
+        self.mock_run.return_value = _result(b'{"ok":true,"op":"status"}')
+        self.client.status()
+        self.client.proxyjump = "bastionuser@bastion"
+        self.client.port = 2222
+        self.client.status()
+        env = self.mock_run.call_args[1]["env"]
+        args = self.mock_run.call_args[0][0]
+        self.assertEqual(env["SESSH_PROXYJUMP"], "bastionuser@bastion")
+        self.assertEqual(
+            args, ["sessh", "status", "test", "user@example.com", "2222"]
+        )
+
+    def test_sessh_bin_resolved_once(self):
+        """Test the sessh binary is resolved to an absolute path once."""
+        self.mock_which.return_value = "/usr/local/bin/sessh"
+        self.mock_run.return_value = _result(b'{"ok":true,"op":"status"}')
+        client = SesshClient("test", "user@example.com")
+        client.status()
+        client.logs(10)
+        argv = self.mock_run.call_args[0][0]
+        self.assertEqual(argv[0], "/usr/local/bin/sessh")
+        self.mock_which.assert_called_once_with("sessh")
+
+    def test_sessh_bin_relative_path_made_absolute(self):
+        """Test a PATH hit in a relative directory is cached as absolute."""
+        self.mock_which.return_value = os.path.join("rb", "sessh")
+        self.mock_run.return_value = _result(b'{"ok":true,"op":"status"}')
+        self.client.status()
+        argv = self.mock_run.call_args[0][0]
+        self.assertEqual(argv[0], os.path.join(os.getcwd(), "rb", "sessh"))
+        self.assertTrue(os.path.isabs(argv[0]))
+
+    def test_sessh_bin_reresolved_on_path_change(self):
+        """Test a PATH change makes the next call look the binary up again."""
+        self.mock_which.return_value = "/old/bin/sessh"
+        self.mock_run.return_value = _result(b'{"ok":true,"op":"status"}')
+        self.client.status()
+        self.mock_which.return_value = "/new/bin/sessh"
+        with patch.dict("os.environ", {"PATH": "/new/bin"}):
+            self.client.status()
+        self.assertEqual(self.mock_run.call_args[0][0][0], "/new/bin/sessh")
+
+    def test_attach(self):
+        """Test attach runs interactively with the session argv."""
+        self.client.attach()
+        args = self.mock_run.call_args[0][0]
+        self.assertEqual(args, ["sessh", "attach", "test", "user@example.com"])
+        self.assertNotIn("capture_output", self.mock_run.call_args[1])
+        self.assertNotIn("SESSH_JSON", self.mock_run.call_args[1]["env"])
+
+    def test_failure_raises(self):
+        """Test a failed call with no JSON output raises RuntimeError."""
+        self.mock_run.return_value = _result(
+            b"", returncode=1, stderr=b"ssh: connection refused"
+        )
+        with self.assertRaisesRegex(RuntimeError, "connection refused"):
+            self.client.status()
+        self.assertEqual(
+            self.mock_run.call_args[1]["stdin"], subprocess.DEVNULL
+        )
+
+    def test_invalid_json_raises(self):
+        """Test non-JSON output raises RuntimeError."""
+        self.mock_run.return_value = _result(b"not json")
+        with self.assertRaisesRegex(RuntimeError, "Invalid JSON"):
+            self.client.status()
+
 
 if __name__ == "__main__":
     unittest.main()
-